@@ -2,19 +2,30 @@
 NRLDC Intra-Day Forecast — Ingestion / Extraction
 --------------------------------------------------
 Scans:   data/raw/<YYYY>/<Month>/nr_forecast_report_DD-MM-YYYY.xlsx
-Outputs: data/extracted/nrldc_extracted.csv
+Outputs: data/extracted/nrldc_extracted.parquet
+         data/extracted/nrldc_extracted.csv  (only if NRLDC_WRITE_CSV=1)
 
 Usage:
     python src/ingestion/test.py
 """
 
-import glob
+import hashlib
+import json
 import logging
 import os
+import posixpath
 import re
+import shutil
+import xml.etree.ElementTree as ET
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
+from functools import lru_cache
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 # Logging setup
 LOGS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "logs"))
@@ -29,47 +40,296 @@ ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 DOWNLOAD_DIR = os.path.join(ROOT_DIR, "data", "raw")
 OUTPUT_DIR = os.path.join(ROOT_DIR, "data", "extracted")
 OUTPUT_FILE = os.path.join(OUTPUT_DIR, "nrldc_extracted.parquet")
+CSV_OUTPUT_FILE = OUTPUT_FILE.replace(".parquet", ".csv")
+
+# Incremental runs: per-file extraction results are cached and only workbooks
+# whose fingerprint changed since the last run are parsed again.
+MANIFEST_FILE = os.path.join(OUTPUT_DIR, ".manifest.json")
+CACHE_DIR = os.path.join(OUTPUT_DIR, "_cache")
+
+# Set NRLDC_WRITE_CSV=1 to also emit a CSV copy of the output
+WRITE_CSV = os.environ.get("NRLDC_WRITE_CSV", "").lower() in ("1", "true", "yes")
 
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
 
 # ── Helpers ───────────────────────────────────────────────────────────────────
-def extract_date_from_filename(file_path: str) -> pd.Timestamp:
+REPORT_PREFIX = "nr-forecast-report-"
+_SEP_TABLE = str.maketrans("_", "-")
+
+
+def extract_date_from_filename(file_path: str) -> datetime:
     """
     Pull the date from filenames like:
         nr_forecast_report_01-01-2026.xlsx  →  2026-01-01
         nr_forecast_report_22_04_2025.xlsx  →  2025-04-22  (underscore variant)
     """
-    match = re.search(r"(\d{2})[_-](\d{2})[_-](\d{4})", os.path.basename(file_path))
+    return _parse_report_date(os.path.basename(file_path))
+
+
+@lru_cache(maxsize=None)
+def _parse_report_date(filename: str) -> datetime:
+    # Normalise "_" → "-" once; the date then sits at a fixed offset
+    base = filename.translate(_SEP_TABLE)
+    if base.startswith(REPORT_PREFIX):
+        try:
+            start = len(REPORT_PREFIX)
+            return datetime.strptime(base[start : start + 10], "%d-%m-%Y")
+        except ValueError:
+            pass
+
+    # Slow path for files renamed outside the scraper's naming scheme
+    match = re.search(r"(\d{2})-(\d{2})-(\d{4})", base)
     if not match:
-        raise ValueError(f"Date not found in filename: {os.path.basename(file_path)}")
-    date_str = f"{match.group(1)}-{match.group(2)}-{match.group(3)}"
-    return pd.to_datetime(date_str, format="%d-%m-%Y")
+        raise ValueError(f"Date not found in filename: {filename}")
+    return datetime.strptime("-".join(match.groups()), "%d-%m-%Y")
+
+
+# Per-file extraction result (the date column is added after concat)
+EXTRACT_SCHEMA = pa.schema(
+    [("timestamp", pa.string()), ("actual_demand_mw", pa.float32())]
+)
+# Bump whenever extraction output changes (row filtering, value parsing, ...)
+# so per-file results cached by an older version are rebuilt.
+EXTRACT_VERSION = 1
+
+
+def extract_nrldc_data(file_path: str) -> tuple[datetime, pa.Table]:
+    """
+    Read one NRLDC forecast Excel file and return (date, table) where table has:
+        timestamp | actual_demand_mw
+    The date is constant per file, so it is returned once rather than
+    broadcast to every row; main() materialises the column after concat.
+    """
+    timestamps, demands = _read_demand_rows(file_path)
+    # MW values fit comfortably in float32 — half the size going into concat
+    table = pa.table(
+        [pa.array(timestamps, type=pa.string()), pa.array(demands.astype(np.float32))],
+        schema=EXTRACT_SCHEMA,
+    )
+    return extract_date_from_filename(file_path), table
+
+
+# ── XLSX streaming ────────────────────────────────────────────────────────────
+# Only two columns of the first worksheet are needed, so the workbook is read
+# straight from its zipped XML instead of building a full DataFrame per sheet.
+FIRST_DATA_ROW = 5  # Excel rows 1–4 are the title block and column headers
+TIMESTAMP_COL = "B"  # Period
+DEMAND_COL = "E"  # MW / Actual Demand
+
+
+def _local_name(tag: str) -> str:
+    """Strip the XML namespace: '{ns}row' → 'row'."""
+    return tag.rsplit("}", 1)[-1]
+
+
+def _text_runs(elem) -> str:
+    """Concatenate the <t> runs of a shared/inline string (skips phonetic runs)."""
+    parts = []
+    for child in elem:
+        name = _local_name(child.tag)
+        if name == "t":
+            parts.append(child.text or "")
+        elif name == "r":
+            parts.extend(t.text or "" for t in child if _local_name(t.tag) == "t")
+    return "".join(parts)
+
+
+def _load_shared_strings(zf: zipfile.ZipFile) -> list:
+    if "xl/sharedStrings.xml" not in zf.namelist():
+        return []
+    strings = []
+    with zf.open("xl/sharedStrings.xml") as fh:
+        for _, elem in ET.iterparse(fh):
+            if _local_name(elem.tag) == "si":
+                strings.append(_text_runs(elem))
+                elem.clear()
+    return strings
+
+
+def _first_sheet_path(zf: zipfile.ZipFile) -> str:
+    """
+    Resolve the first sheet in workbook order (what pd.read_excel reads by
+    default) through xl/workbook.xml and its relationships part.
+    """
+    workbook = ET.fromstring(zf.read("xl/workbook.xml"))
+    sheet = next((e for e in workbook.iter() if _local_name(e.tag) == "sheet"), None)
+    if sheet is None:
+        raise ValueError("No worksheet found in workbook")
+    # r:id — the relationships namespace differs between transitional/strict
+    rel_id = next(v for k, v in sheet.attrib.items() if _local_name(k) == "id")
+
+    rels = ET.fromstring(zf.read("xl/_rels/workbook.xml.rels"))
+    for rel in rels:
+        if rel.get("Id") == rel_id:
+            target = rel.get("Target")
+            if target.startswith("/"):
+                return target.lstrip("/")
+            return posixpath.normpath(posixpath.join("xl", target))
+    raise ValueError(f"Relationship {rel_id} for first sheet not found")
+
+
+def _cell_value(cell, shared_strings: list):
+    """Return the cached value of a <c> element as text (None if empty)."""
+    cell_type = cell.get("t", "n")
+    if cell_type == "inlineStr":
+        for child in cell:
+            if _local_name(child.tag) == "is":
+                return _text_runs(child)
+        return None
+
+    value = None
+    for child in cell:
+        if _local_name(child.tag) == "v":
+            value = child.text
+            break
+    if value is not None and cell_type == "s":
+        return shared_strings[int(value)]
+    return value
+
+
+def _is_number(text: str) -> bool:
+    try:
+        float(text)
+        return True
+    except ValueError:
+        return False
+
+
+def _to_float64(texts: list) -> np.ndarray:
+    """
+    Convert numeric cell text to float64 in one C-level cast. numpy parses
+    each string with float()'s rules, so anything _is_number accepted casts.
+    """
+    return np.array(texts, dtype=np.float64)
+
+
+def _read_demand_rows(file_path: str) -> tuple[list, np.ndarray]:
+    """
+    Stream the first worksheet and return (timestamps, demands) where demands
+    is a float64 array aligned with the timestamps list.
+
+    Rows whose demand cell is not numeric ("Period" footer, blank rows,
+    repeated headers, etc.) are dropped — every genuine data row has one.
+    """
+    timestamps = []
+    demand_texts = []
+    with zipfile.ZipFile(file_path) as zf:
+        shared_strings = _load_shared_strings(zf)
+        with zf.open(_first_sheet_path(zf)) as fh:
+            row_num = 0
+            for _, elem in ET.iterparse(fh):
+                if _local_name(elem.tag) != "row":
+                    continue
+                row_num = int(elem.get("r") or row_num + 1)
+                if row_num < FIRST_DATA_ROW:
+                    elem.clear()
+                    continue
+
+                timestamp = demand = None
+                numeric_cell = False
+                for cell in elem:
+                    col = cell.get("r", "").rstrip("0123456789")
+                    if col == TIMESTAMP_COL:
+                        timestamp = _cell_value(cell, shared_strings)
+                    elif col == DEMAND_COL:
+                        demand = _cell_value(cell, shared_strings)
+                        numeric_cell = cell.get("t", "n") == "n"
+                elem.clear()
+
+                # Numeric cells always parse; text cells only count if they
+                # happen to hold a number
+                if demand is None or not (numeric_cell or _is_number(demand)):
+                    continue
+                timestamps.append(timestamp)
+                demand_texts.append(demand)
+
+    # Convert the whole column at once instead of float() per row
+    demands = _to_float64(demand_texts)
+    valid = ~np.isnan(demands)
+    if not valid.all():
+        timestamps = [t for t, ok in zip(timestamps, valid) if ok]
+        demands = demands[valid]
+    return timestamps, demands
+
+
+def _iter_xlsx_files(directory: str):
+    """
+    Yield every .xlsx path under data/raw/<YYYY>/<Month>/ (any depth).
+    os.scandir reuses the directory entry's type info, so no extra stat()
+    per file as glob does.
+    """
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _iter_xlsx_files(entry.path)
+            elif entry.name.endswith(".xlsx") and entry.is_file(follow_symlinks=False):
+                yield entry.path
+
+
+def _safe_extract(file_path: str):
+    """
+    Worker entry point: never raises, so one bad workbook can't take down the
+    pool. Returns (file_path, (date, table)_or_None, error_or_None).
+    """
+    try:
+        return file_path, extract_nrldc_data(file_path), None
+    except Exception as e:
+        return file_path, None, e
+
 
+# ── Extraction cache ──────────────────────────────────────────────────────────
+def _fingerprint(file_path: str) -> list:
+    """[mtime_ns, size, sha1 of the first 4 KB] — cheap change detection."""
+    st = os.stat(file_path)
+    with open(file_path, "rb") as fh:
+        head = hashlib.sha1(fh.read(4096)).hexdigest()
+    return [st.st_mtime_ns, st.st_size, head]
 
-def extract_nrldc_data(file_path: str) -> pd.DataFrame:
+
+def _cache_path(rel_path: str) -> str:
+    return os.path.join(CACHE_DIR, rel_path + ".parquet")
+
+
+def _extract_version() -> str:
+    schema_hash = hashlib.sha1(EXTRACT_SCHEMA.to_string().encode()).hexdigest()
+    return f"{EXTRACT_VERSION}-{schema_hash[:12]}"
+
+
+def _load_manifest() -> dict:
     """
-    Read one NRLDC forecast Excel file and return a tidy DataFrame with columns:
-        date | timestamp | actual_demand_mw
+    Return {relpath: fingerprint} from the last run, or {} if there is none
+    or it was written by a different extraction version (cache is dropped).
     """
-    df = pd.read_excel(file_path, header=None)
+    try:
+        with open(MANIFEST_FILE, encoding="utf-8") as fh:
+            manifest = json.load(fh)
+    except (OSError, ValueError):
+        manifest = {}
+    if manifest.get("extract_version") == _extract_version():
+        return manifest.get("files", {})
 
-    # Row 3 (0-indexed) contains the real column headers
-    df.columns = df.iloc[3]
-    df = df.iloc[4:].reset_index(drop=True)
+    shutil.rmtree(CACHE_DIR, ignore_errors=True)
+    return {}
 
-    # Columns of interest: Period (col 1) and MW/Actual Demand (col 4)
-    df = df.iloc[:, [1, 4]].copy()
-    df.columns = ["timestamp", "actual_demand_mw"]
 
-    df["actual_demand_mw"] = pd.to_numeric(df["actual_demand_mw"], errors="coerce")
-    df["date"] = extract_date_from_filename(file_path)
+def _save_manifest(files: dict):
+    manifest = {"extract_version": _extract_version(), "files": files}
+    tmp_file = MANIFEST_FILE + ".tmp"
+    with open(tmp_file, "w", encoding="utf-8") as fh:
+        json.dump(manifest, fh, indent=2, sort_keys=True)
+    os.replace(tmp_file, MANIFEST_FILE)
 
-    # Drop non-data rows: "Period" footer, blank rows, repeated headers, etc.
-    # Any genuine data row always has a numeric actual_demand_mw value.
-    df = df.dropna(subset=["actual_demand_mw"])
 
-    return df[["date", "timestamp", "actual_demand_mw"]]
+def _write_cache(rel_path: str, table: pa.Table) -> bool:
+    cache_file = _cache_path(rel_path)
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        pq.write_table(table, cache_file)
+        return True
+    except Exception as e:
+        logging.warning(f"Could not cache {rel_path}: {e}")
+        return False
 
 
 # ── Main ──────────────────────────────────────────────────────────────────────
@@ -80,29 +340,88 @@ def main():
     logging.info("Data merger execution started")
     logging.info("")
 
-    pattern = os.path.join(DOWNLOAD_DIR, "**", "*.xlsx")
-    all_files = sorted(glob.glob(pattern, recursive=True))
+    all_files = (
+        sorted(_iter_xlsx_files(DOWNLOAD_DIR)) if os.path.isdir(DOWNLOAD_DIR) else []
+    )
     total = len(all_files)
 
     if not total:
         print(f"[WARN]  No .xlsx files found under: {DOWNLOAD_DIR}")
         return
 
-    print(f"Scanning  {total} file(s)  →  {os.path.relpath(OUTPUT_FILE, ROOT_DIR)}")
+    old_manifest = _load_manifest()
+    manifest = {}
+    fingerprints = {}
+    results = {}
+    pending = []
+
+    # Reuse cached extractions for workbooks that haven't changed
+    for file_path in all_files:
+        rel_path = os.path.relpath(file_path, DOWNLOAD_DIR)
+        try:
+            fingerprints[file_path] = _fingerprint(file_path)
+        except OSError:
+            pending.append(file_path)
+            continue
+        if old_manifest.get(rel_path) == fingerprints[file_path]:
+            try:
+                table = pq.read_table(_cache_path(rel_path))
+                date = extract_date_from_filename(file_path)
+                results[file_path] = ((date, table), None)
+                manifest[rel_path] = fingerprints[file_path]
+                continue
+            except Exception:
+                pass  # missing / unreadable cache entry → extract again
+        pending.append(file_path)
+
+    cached = len(results)
+    print(
+        f"Scanning  {total} file(s)  →  {os.path.relpath(OUTPUT_FILE, ROOT_DIR)}"
+        + (f"  ({cached} unchanged, cached)" if cached else "")
+    )
 
-    df_list = []
+    if pending:
+        # Workbooks are independent and parsing is CPU-bound → one process per
+        # core, but never more processes than there are files to parse
+        workers = min(os.cpu_count() or 1, len(pending))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_safe_extract, f) for f in pending]
+            for idx, future in enumerate(as_completed(futures), start=1):
+                # Overwrite the same line with a live counter
+                print(f"  Processing... {idx}/{len(pending)}", end="\r", flush=True)
+                file_path, result, err = future.result()
+                results[file_path] = (result, err)
+
+                rel_path = os.path.relpath(file_path, DOWNLOAD_DIR)
+                if err is None and file_path in fingerprints:
+                    if _write_cache(rel_path, result[1]):
+                        manifest[rel_path] = fingerprints[file_path]
+
+    # Drop cache entries for workbooks that were removed or failed this run
+    for rel_path in old_manifest.keys() - manifest.keys():
+        try:
+            os.remove(_cache_path(rel_path))
+        except OSError:
+            pass
+    _save_manifest(manifest)
+
+    # Re-assemble in file order so duplicate resolution stays deterministic
+    dates = []
+    tables = []
     skipped = 0
     warnings = []
 
-    for idx, file_path in enumerate(all_files, start=1):
-        # Overwrite the same line with a live counter
-        print(f"  Processing... {idx}/{total}", end="\r", flush=True)
-        try:
-            df = extract_nrldc_data(file_path)
-            df_list.append(df)
-        except Exception as e:
+    for file_path in all_files:
+        result, err = results[file_path]
+        if err is None:
+            date, table = result
+            dates.append(date)
+            tables.append(table)
+        else:
             skipped += 1
-            warnings.append(f"  [WARN]  {os.path.relpath(file_path, ROOT_DIR)}  — {e}")
+            warnings.append(
+                f"  [WARN]  {os.path.relpath(file_path, ROOT_DIR)}  — {err}"
+            )
 
     # Clear the progress line
     print(" " * 40, end="\r")
@@ -110,22 +429,36 @@ def main():
     if warnings:
         print("\n".join(warnings))
 
-    if not df_list:
+    if not tables:
         print("[ERR]   No files could be processed. Aborting.")
         return
 
-    final_df = (
-        pd.concat(df_list, ignore_index=True)
-        .sort_values(["date", "timestamp"])
-        .reset_index(drop=True)
+    # One columnar concat + sort in Arrow, then a single pandas materialisation
+    merged = pa.concat_tables(tables)
+    date_col = np.repeat(
+        np.array(dates, dtype="datetime64[D]"), [t.num_rows for t in tables]
+    )
+    merged = merged.add_column(0, "date", pa.array(date_col)).sort_by(
+        [("date", "ascending"), ("timestamp", "ascending")]
+    )
+    # split_blocks + self_destruct: hand each Arrow column to pandas without
+    # consolidating into a 2-D block, freeing the Arrow buffers as it goes
+    # date → datetime64, timestamp → Arrow-backed string (no per-row PyObjects)
+    final_df = merged.to_pandas(
+        date_as_object=False,
+        split_blocks=True,
+        self_destruct=True,
+        types_mapper={pa.string(): pd.StringDtype("pyarrow")}.get,
     )
+    del merged
 
     pre_dedup_rows = len(final_df)
     final_df = final_df.drop_duplicates(subset=["date", "timestamp"], keep="last")
     removed_duplicates = pre_dedup_rows - len(final_df)
 
-    # final_df.to_csv(OUTPUT_FILE, index=False)
-    final_df.to_parquet(OUTPUT_FILE, index=False, engine="pyarrow")
+    final_df.to_parquet(OUTPUT_FILE, index=False, engine="pyarrow", compression="zstd")
+    if WRITE_CSV:
+        final_df.to_csv(CSV_OUTPUT_FILE, index=False)
 
     succeeded = total - skipped
     date_range = f"{final_df['date'].min().date()}  →  {final_df['date'].max().date()}"
@@ -140,6 +473,8 @@ def main():
         print(f"  De-duped  : removed {removed_duplicates:,} duplicate row(s)")
     print(f"  Date span : {date_range}")
     print(f"  Output    : data/extracted/nrldc_extracted.parquet")
+    if WRITE_CSV:
+        print(f"              data/extracted/nrldc_extracted.csv")
     print(f"{'─' * 50}")
 
     end_time = datetime.now()
@@ -150,6 +485,7 @@ def main():
     logging.info("")
     logging.info("Summary")
     logging.info(f"Files processed: {succeeded}")
+    logging.info(f"Files reused from cache: {cached}")
     logging.info(f"Rows processed: {len(final_df):,}")
     logging.info(f"Duplicates removed: {removed_duplicates:,}")
     logging.info(f"Date range: {date_range}")
@@ -11,7 +11,8 @@ Structure:
   • Each file row has an 'action' column with a download anchor.
 
 Strategy per year:
-  1. Fresh driver.get(BASE_URL) → guarantees clean state between years.
+  1. Collapse the previously open year in place (falls back to a fresh
+     driver.get(BASE_URL) if the months don't appear).
   2. Click year button → accordion opens, months appear.
   3. Filter months: skip any month in the current year that is AFTER today.
   4. For each remaining month: find button directly, click, select 50 rows,
@@ -20,11 +21,18 @@ Strategy per year:
 
 import calendar
 import glob
+import json
 import logging
 import os
+import re
 import sys
+import tempfile
+import threading
 import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from urllib.parse import unquote, urlparse
 
 # Logging setup
 LOGS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "logs"))
@@ -46,6 +54,7 @@ for noisy_logger in ("WDM", "webdriver_manager", "urllib3"):
     _lib_logger.setLevel(logging.WARNING)
     _lib_logger.propagate = False
 
+import requests
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
@@ -53,6 +62,11 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import Select, WebDriverWait
 from webdriver_manager.chrome import ChromeDriverManager
 
+try:
+    import websocket  # websocket-client, installed alongside selenium
+except ImportError:
+    websocket = None
+
 # ── Config ────────────────────────────────────────────────────────────────────
 BASE_URL = "https://nrldc.in/forecast/intra-day-forecast"
 BASE_DOWNLOAD_DIR = os.path.abspath(
@@ -60,6 +74,9 @@ BASE_DOWNLOAD_DIR = os.path.abspath(
 )
 os.makedirs(BASE_DOWNLOAD_DIR, exist_ok=True)
 
+# Parallel HTTP fetches per table page (files are small; latency-bound)
+DOWNLOAD_WORKERS = 8
+
 # Current date used to skip future months
 TODAY = datetime.now()
 MONTH_MAP = {
@@ -100,6 +117,12 @@ def get_driver(download_dir: str) -> webdriver.Chrome:
             "plugins.always_open_pdf_externally": True,
         },
     )
+    # Headless + eager: no GUI to paint, and driver.get() returns once the DOM
+    # is ready instead of waiting for every image/stylesheet to finish.
+    options.add_argument("--headless=new")
+    options.page_load_strategy = "eager"
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    options.add_argument("--disable-extensions")
     options.add_argument("--no-sandbox")
     options.add_argument("--disable-dev-shm-usage")
     options.add_argument("--disable-gpu")
@@ -137,6 +160,132 @@ def wait_for_downloads(directory: str, timeout: int = 90):
     return False
 
 
+class DownloadTracker:
+    """
+    Event-driven download completion via the browser's DevTools websocket.
+
+    Subscribes to Browser.downloadWillBegin / Browser.downloadProgress and
+    tracks outstanding download GUIDs, so a page of downloads can be awaited
+    without polling the directory for .crdownload files.
+    """
+
+    def __init__(self, driver: webdriver.Chrome):
+        if websocket is None:
+            raise RuntimeError("websocket-client is not installed")
+        address = driver.capabilities["goog:chromeOptions"]["debuggerAddress"]
+        with urllib.request.urlopen(f"http://{address}/json/version", timeout=5) as r:
+            ws_url = json.load(r)["webSocketDebuggerUrl"]
+        self._ws = websocket.create_connection(ws_url, timeout=1, suppress_origin=True)
+        self._cond = threading.Condition()
+        self._pending: set[str] = set()
+        self._begun = 0
+        self._last_event = time.time()
+        self._msg_id = 0
+        self._responses: dict[int, dict] = {}
+        self._closed = False
+        threading.Thread(target=self._listen, daemon=True).start()
+
+    def _call(self, method: str, params: dict, timeout: float = 5) -> dict:
+        """Send a CDP command and wait for its response; raise if rejected."""
+        with self._cond:
+            self._msg_id += 1
+            msg_id = self._msg_id
+        payload = {"id": msg_id, "method": method, "params": params}
+        self._ws.send(json.dumps(payload))
+
+        deadline = time.time() + timeout
+        with self._cond:
+            while msg_id not in self._responses:
+                remaining = deadline - time.time()
+                if remaining <= 0 or self._closed:
+                    raise RuntimeError(f"No response to {method}")
+                self._cond.wait(timeout=remaining)
+            response = self._responses.pop(msg_id)
+        if "error" in response:
+            raise RuntimeError(f"{method} rejected: {response['error']}")
+        return response.get("result", {})
+
+    def _listen(self):
+        while not self._closed:
+            try:
+                msg = json.loads(self._ws.recv())
+            except websocket.WebSocketTimeoutException:
+                continue
+            except Exception:
+                # Socket closed — wake anyone waiting on a command response
+                with self._cond:
+                    self._closed = True
+                    self._cond.notify_all()
+                break
+
+            method = msg.get("method")
+            params = msg.get("params", {})
+            finished = params.get("state") in ("completed", "canceled")
+            with self._cond:
+                if "id" in msg:
+                    self._responses[msg["id"]] = msg
+                elif method == "Browser.downloadWillBegin":
+                    self._pending.add(params["guid"])
+                    self._begun += 1
+                elif method == "Browser.downloadProgress" and finished:
+                    self._pending.discard(params["guid"])
+                else:
+                    continue
+                self._last_event = time.time()
+                self._cond.notify_all()
+
+    def set_download_dir(self, directory: str):
+        """Point downloads at `directory`; raises if the browser rejects it."""
+        self._call(
+            "Browser.setDownloadBehavior",
+            {
+                "behavior": "allow",
+                "downloadPath": os.path.abspath(directory),
+                "eventsEnabled": True,
+            },
+        )
+
+    def reset(self):
+        """Call before triggering a batch of downloads."""
+        with self._cond:
+            self._begun = 0
+            self._last_event = time.time()
+
+    def wait(
+        self, directory: str, expected: int, timeout: int = 90, idle: float = 2.0
+    ) -> bool:
+        """
+        Block until every started download has finished and either `expected`
+        downloads have begun or no new one has started for `idle` seconds.
+        If no download event arrived at all, fall back to polling `directory`
+        — the clicks may have produced downloads the events never reported.
+        """
+        deadline = time.time() + timeout
+        with self._cond:
+            while True:
+                now = time.time()
+                if not self._pending and (
+                    self._begun >= expected or now - self._last_event >= idle
+                ):
+                    begun = self._begun
+                    break
+                if now >= deadline:
+                    print("\n  [WARN] Download timeout — some files may be incomplete.")
+                    return False
+                self._cond.wait(timeout=min(0.25, deadline - now))
+
+        if begun == 0:
+            return wait_for_downloads(directory, timeout=max(1, int(deadline - now)))
+        return True
+
+    def close(self):
+        self._closed = True
+        try:
+            self._ws.close()
+        except Exception:
+            pass
+
+
 def count_files(directory: str) -> int:
     return len(
         [f for f in os.listdir(directory) if os.path.isfile(os.path.join(directory, f))]
@@ -157,19 +306,49 @@ def get_existing_files(directory: str) -> set:
 
 # ── Page helpers ──────────────────────────────────────────────────────────────
 TABLE_ID = "operationsTable"
-FOLDER_BTN_XPATH = "//button[contains(@class,'folder-icon') and @data-folderid]"
+FOLDER_BTN_CSS = "button.folder-icon[data-folderid]"
 
 
-def wait_table_loaded(wait: WebDriverWait):
+def load_base_page(driver, timeout: int = 15):
+    """Open BASE_URL and wait until the folder buttons have been rendered."""
+    driver.get(BASE_URL)
     try:
-        wait.until(
-            EC.invisibility_of_element_located(
-                (By.CSS_SELECTOR, f"#{TABLE_ID}_processing")
-            )
+        WebDriverWait(driver, timeout).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, FOLDER_BTN_CSS))
         )
     except Exception:
-        pass
-    time.sleep(2)
+        pass  # callers report missing buttons themselves
+
+
+def first_table_row(driver):
+    """The table's current first body row (None if absent) — see wait_table_loaded."""
+    rows = driver.find_elements(By.CSS_SELECTOR, f"#{TABLE_ID} tbody tr")
+    return rows[0] if rows else None
+
+
+def wait_table_loaded(wait: WebDriverWait, old_row=None):
+    """
+    Wait for the DataTable to redraw after a click. DataTables rebuilds the
+    tbody on every draw, so the row captured before the click (`old_row`)
+    going stale is the signal that new data is in; then the spinner must be
+    gone and rows rendered. Without an old row there is no redraw signal,
+    so fall back to a fixed pause.
+    """
+    spinner = (By.CSS_SELECTOR, f"#{TABLE_ID}_processing")
+    rows = (By.CSS_SELECTOR, f"#{TABLE_ID} tbody tr")
+    conditions = [
+        EC.invisibility_of_element_located(spinner),
+        EC.presence_of_element_located(rows),
+    ]
+    if old_row is not None:
+        conditions.insert(0, EC.staleness_of(old_row))
+    for condition in conditions:
+        try:
+            wait.until(condition)
+        except Exception:
+            pass
+    if old_row is None:
+        time.sleep(2)
 
 
 def click_btn(driver, el):
@@ -177,16 +356,69 @@ def click_btn(driver, el):
     driver.execute_script("arguments[0].click();", el)
 
 
-def get_folder_buttons(driver):
-    return driver.find_elements(By.XPATH, FOLDER_BTN_XPATH)
+def get_folder_buttons(driver) -> list[tuple[str, str]]:
+    """
+    Return [(data-foldername, data-folderid), ...] for every folder button.
+    Read in a single JS call rather than one round-trip per element attribute.
+    """
+    return driver.execute_script(
+        "return [...document.querySelectorAll(arguments[0])].map(b => "
+        "[(b.dataset.foldername || '').trim(), b.dataset.folderid || '']);",
+        FOLDER_BTN_CSS,
+    )
+
+
+# Visible folder buttons inside the accordion panel the given year button
+# controls (data-bs-target / data-target / aria-controls). If the button
+# names no panel, or that panel holds no month buttons (they may be rendered
+# elsewhere by the table reload), every visible folder button on the page is
+# returned and get_month_buttons' per-year exclusion does the scoping.
+_MONTH_BUTTONS_JS = """
+const [sel, fid] = arguments;
+const yearBtn = [...document.querySelectorAll(sel)]
+    .find(b => b.dataset.folderid === fid);
+let scope = null;
+if (yearBtn) {
+    const controls = yearBtn.getAttribute('aria-controls');
+    const ref = yearBtn.getAttribute('data-bs-target')
+        || yearBtn.getAttribute('data-target')
+        || (controls ? '#' + CSS.escape(controls) : null);
+    try { scope = ref ? document.querySelector(ref) : null; } catch (e) {}
+}
+const collect = root => [...root.querySelectorAll(sel)]
+    .filter(b => b !== yearBtn && b.offsetParent !== null)
+    .map(b => [(b.dataset.foldername || '').trim(), b.dataset.folderid || '']);
+const isMonth = ([name]) => name && !/^\\d{4}$/.test(name);
+let buttons = scope ? collect(scope) : [];
+if (!buttons.some(isMonth)) buttons = collect(document);
+return buttons;
+"""
+
+# Month fids collected per year fid — a month button already seen under
+# another year is never attributed to the year currently open.
+_month_fids_by_year: dict[str, set] = {}
+
+
+def get_month_buttons(driver, year_fid: str) -> list[tuple[str, str]]:
+    """[(month_name, month_fid), ...] belonging to the expanded `year_fid`."""
+    other_years = set()
+    for fid, month_fids in _month_fids_by_year.items():
+        if fid != year_fid:
+            other_years |= month_fids
+    return [
+        (name, fid)
+        for name, fid in driver.execute_script(
+            _MONTH_BUTTONS_JS, FOLDER_BTN_CSS, year_fid
+        )
+        if name and not (name.isdigit() and len(name) == 4) and fid not in other_years
+    ]
 
 
 def find_btn_by_fid(driver, fid: str):
     """Find a folder button by its data-folderid. Returns None if not found."""
     try:
         return driver.find_element(
-            By.XPATH,
-            f"//button[contains(@class,'folder-icon') and @data-folderid='{fid}']",
+            By.CSS_SELECTOR, f'button.folder-icon[data-folderid="{fid}"]'
         )
     except Exception:
         return None
@@ -204,7 +436,10 @@ def table_has_no_data(driver) -> bool:
 
 
 def try_set_50_rows(driver):
-    """Try to set the DataTable length to 50. Tries several selector patterns."""
+    """
+    Try to set the DataTable length to 50. Tries several selector patterns.
+    Returns True only if the length changed (i.e. the table will redraw).
+    """
     selectors = [
         f"#{TABLE_ID}_length select",
         f"select[name='{TABLE_ID}_length']",
@@ -220,37 +455,39 @@ def try_set_50_rows(driver):
                 if "50" in opts
                 else max(opts, key=lambda x: int(x) if x.isdigit() else 0)
             )
-            Select(el).select_by_visible_text(target)
+            select = Select(el)
+            if select.first_selected_option.text.strip() == target:
+                return False  # already showing that many rows — no redraw
+            select.select_by_visible_text(target)
             return True
         except Exception:
             continue
     return False
 
 
-def get_download_links(driver):
-    """Return all download anchors from the current table page."""
-    for icon_cls in ["fa-download", "glyphicon-download-alt", "download-icon"]:
-        links = driver.find_elements(
-            By.XPATH, f"//*[@id='{TABLE_ID}']//a[.//i[contains(@class,'{icon_cls}')]]"
-        )
-        if links:
-            return links, f"icon·{icon_cls}"
-
-    links = driver.find_elements(
-        By.XPATH,
-        f"//*[@id='{TABLE_ID}']//a["
-        "contains(@href,'.xls') or contains(@href,'.xlsx') or "
-        "contains(@href,'.csv') or contains(@href,'.pdf') or "
-        "contains(@href,'.zip')]",
-    )
-    if links:
-        return links, "href-ext"
+# Collect every download href on the current page in one round-trip:
+# anchors with a download icon or a file extension, else any tbody anchor.
+_DOWNLOAD_HREFS_JS = """
+const table = document.getElementById(arguments[0]);
+if (!table) return [[], 'none'];
+const anchors = [...table.querySelectorAll('a[href]')];
+let links = anchors.filter(a =>
+    /\\.(xlsx?|csv|pdf|zip)/i.test(a.href) ||
+    a.querySelector('i.fa-download, i.glyphicon-download-alt, i.download-icon'));
+let strategy = 'icon/ext';
+if (!links.length) {
+    links = [...table.querySelectorAll('tbody a[href]')];
+    strategy = 'any-anchor';
+}
+if (!links.length) return [[], 'none'];
+return [[...new Set(links.map(a => a.href))], strategy];
+"""
 
-    links = driver.find_elements(By.XPATH, f"//*[@id='{TABLE_ID}']//tbody//a[@href]")
-    if links:
-        return links, "any-anchor"
 
-    return [], "none"
+def get_download_links(driver):
+    """Return (hrefs, strategy) for every download link on the current page."""
+    hrefs, strategy = driver.execute_script(_DOWNLOAD_HREFS_JS, TABLE_ID)
+    return hrefs, strategy
 
 
 def _find_link_by_href(driver, href: str, timeout: float = 4):
@@ -288,24 +525,14 @@ def _find_link_by_href(driver, href: str, timeout: float = 4):
     return None
 
 
-def click_download_links(driver, links, existing_files: set):
+def click_download_links(driver, hrefs, existing_files: set):
     """
     Click download links reliably even when the table re-renders between clicks.
-    Collects all hrefs first, then iterates over the string list so stale
-    element references never cause a crash.  Falls back to JS navigation.
+    Iterates over href strings (not elements) so stale element references
+    never cause a crash.  Falls back to JS navigation.
     """
     any_clicked = False
 
-    # Snapshot hrefs while the elements are still live
-    hrefs = []
-    for link in links:
-        try:
-            href = link.get_attribute("href")
-            if href:
-                hrefs.append(href)
-        except Exception:
-            pass  # stale already — skip
-
     for idx, href in enumerate(hrefs, start=1):
         clicked = False
         # --- Attempt 1: find element and JS-click it ---
@@ -349,6 +576,128 @@ def click_download_links(driver, links, existing_files: set):
     return any_clicked
 
 
+# ── HTTP download helpers ─────────────────────────────────────────────────────
+def sync_session_cookies(driver, session: requests.Session):
+    """Copy the browser's cookies (and user agent) into the requests session."""
+    session.headers["User-Agent"] = driver.execute_script("return navigator.userAgent;")
+    for cookie in driver.get_cookies():
+        session.cookies.set(
+            cookie["name"],
+            cookie["value"],
+            domain=cookie.get("domain"),
+            path=cookie.get("path", "/"),
+        )
+
+
+# Leading bytes each expected file type must start with
+_MAGIC_BYTES = {
+    ".xlsx": b"PK\x03\x04",
+    ".zip": b"PK\x03\x04",
+    ".xls": b"\xd0\xcf\x11\xe0",
+    ".pdf": b"%PDF",
+}
+
+
+def href_filename(href: str) -> str:
+    """
+    Filename a download href is saved under: the URL path's basename when it
+    names a known file type, else "" (e.g. a download.php?id=… endpoint),
+    in which case the name only comes from the response headers.
+    """
+    name = unquote(os.path.basename(urlparse(href).path))
+    return name if os.path.splitext(name)[1].lower() in _MAGIC_BYTES else ""
+
+
+def _filename_from_response(resp, href: str) -> str:
+    # Prefer the href's own name so the skip-existing check, which can't see
+    # response headers, matches what gets written
+    name = href_filename(href)
+    if name:
+        return name
+    disposition = resp.headers.get("Content-Disposition", "")
+    match = re.search(
+        r"filename\*=(?:UTF-8'')?([^;]+)|filename=\"?([^\";]+)\"?", disposition, re.I
+    )
+    if match:
+        name = unquote(match.group(1) or match.group(2)).strip()
+    # Never let a header-supplied name escape the month directory
+    return os.path.basename(name)
+
+
+def _check_payload(resp, filename: str, head: bytes):
+    """
+    Reject responses that aren't the file they claim to be — typically an
+    HTML login / session-expired page served with status 200.
+    """
+    ext = os.path.splitext(filename)[1].lower()
+    content_type = resp.headers.get("Content-Type", "").lower()
+    if "text/html" in content_type and ext not in (".htm", ".html"):
+        raise ValueError(f"{filename}: got an HTML page instead of the file")
+    magic = _MAGIC_BYTES.get(ext)
+    if magic is not None and not head.startswith(magic):
+        raise ValueError(f"{filename}: content does not look like a {ext} file")
+
+
+def http_download(session: requests.Session, href: str, directory: str) -> bool:
+    """
+    Stream one file into `directory`. Returns False if it already existed.
+    Writes to a uniquely named .part file first, so a partial or invalid
+    download is never mistaken for a finished workbook and two threads
+    resolving to the same filename never share a temp file; any failure
+    removes the .part file and raises, so the link goes to the
+    browser-click fallback.
+    """
+    with session.get(href, stream=True, timeout=60) as resp:
+        resp.raise_for_status()
+        filename = _filename_from_response(resp, href)
+        if not filename:
+            raise ValueError(f"No filename for {href}")
+        dest = os.path.join(directory, filename)
+        if os.path.exists(dest):
+            return False
+        fd, tmp_dest = tempfile.mkstemp(
+            prefix=filename + ".", suffix=".part", dir=directory
+        )
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                head = b""
+                for chunk in resp.iter_content(chunk_size=64 * 1024):
+                    if not head:
+                        head = chunk
+                        _check_payload(resp, filename, head)
+                    fh.write(chunk)
+                if not head:
+                    raise ValueError(f"{filename}: empty response")
+            os.chmod(tmp_dest, 0o644)  # mkstemp creates it owner-only
+            os.replace(tmp_dest, dest)
+        except BaseException:
+            try:
+                os.remove(tmp_dest)
+            except OSError:
+                pass
+            raise
+    return True
+
+
+def download_links_http(session: requests.Session, hrefs, directory: str) -> list:
+    """
+    Fetch all hrefs in parallel over plain HTTP.
+    Returns the hrefs that could not be fetched, for the browser-click fallback.
+    """
+    failed = [h for h in hrefs if urlparse(h).scheme not in ("http", "https")]
+    todo = [h for h in hrefs if h not in failed]
+    if not todo:
+        return failed
+    with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as pool:
+        futures = {pool.submit(http_download, session, h, directory): h for h in todo}
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception:
+                failed.append(futures[future])
+    return failed
+
+
 def month_is_future(year: int, month_name: str) -> bool:
     """Return True if this year+month combination is after TODAY."""
     num = MONTH_MAP.get(month_name.lower()[:3])
@@ -358,20 +707,59 @@ def month_is_future(year: int, month_name: str) -> bool:
     return year > TODAY.year or (year == TODAY.year and num > TODAY.month)
 
 
-def open_year(driver, wait, year_fid: str) -> bool:
+_open_year_fid = None  # year accordion currently expanded, if any
+
+
+def open_year(driver, wait, year_fid: str, reload: bool = False) -> bool:
     """
-    Navigate to BASE_URL fresh and click the year accordion button.
+    Expand the year accordion. The previously open year is collapsed with a
+    second click instead of reloading BASE_URL; a fresh page load is only
+    used when `reload` is set or the months don't show up within 5 s.
     Returns True on success.
     """
-    driver.get(BASE_URL)
-    time.sleep(4)
+    global _open_year_fid
+    if not reload:
+        if _open_year_fid is not None and _open_year_fid != year_fid:
+            prev_btn = find_btn_by_fid(driver, _open_year_fid)
+            if prev_btn is not None:
+                # The collapse click reloads the table too; let that draw
+                # finish so it can't be mistaken for the new year's redraw
+                old_row = first_table_row(driver)
+                click_btn(driver, prev_btn)
+                wait_table_loaded(wait, old_row)
+            _open_year_fid = None
+        if _open_year_fid == year_fid and get_month_buttons(driver, year_fid):
+            return True
+        if _expand_year(driver, wait, year_fid):
+            return True
+
+    load_base_page(driver)
+    _open_year_fid = None
+    if find_btn_by_fid(driver, year_fid) is None:
+        print(f"  [ERROR] Year button {year_fid} not found after page reload.")
+        return False
+    _expand_year(driver, wait, year_fid)  # empty years are reported by the caller
+    return True
+
+
+def _expand_year(driver, wait, year_fid: str) -> bool:
+    """
+    Click the year button; True once the table has redrawn and this year's
+    own month buttons are visible.
+    """
+    global _open_year_fid
     btn = find_btn_by_fid(driver, year_fid)
     if btn is None:
-        print(f"  [ERROR] Year button {year_fid} not found after page reload.")
         return False
+    old_row = first_table_row(driver)
     click_btn(driver, btn)
-    wait_table_loaded(wait)
-    return True
+    _open_year_fid = year_fid
+    wait_table_loaded(wait, old_row)
+    try:
+        WebDriverWait(driver, 5).until(lambda d: get_month_buttons(d, year_fid))
+        return True
+    except Exception:
+        return False
 
 
 # ── Main ──────────────────────────────────────────────────────────────────────
@@ -388,28 +776,30 @@ logger.info("Scraping execution started")
 
 driver = None
 wait = None
+download_tracker = None
+http_session = requests.Session()
 
 try:
     driver = get_driver(BASE_DOWNLOAD_DIR)
+    try:
+        download_tracker = DownloadTracker(driver)
+    except Exception as exc:
+        print(f"[INFO] DevTools download events unavailable ({exc}); polling instead.")
+        download_tracker = None
     wait = WebDriverWait(driver, 30)
 
     # ── Step 1: Collect year folder IDs from initial page load ────────────────
-    driver.get(BASE_URL)
-    time.sleep(4)
+    load_base_page(driver)
 
     year_data: list[tuple[str, str]] = []  # [(year_name, year_fid), ...]
-    for btn in get_folder_buttons(driver):
-        name = (btn.get_attribute("data-foldername") or "").strip()
-        fid = btn.get_attribute("data-folderid") or ""
+    for name, fid in get_folder_buttons(driver):
         if name.isdigit() and len(name) == 4:
             year_data.append((name, fid))
 
     if not year_data:
         print("[ERROR] No year buttons found. Page structure may have changed.")
-        for b in get_folder_buttons(driver):
-            print(
-                f"  fid='{b.get_attribute('data-folderid')}'  name='{b.get_attribute('data-foldername')}'"
-            )
+        for name, fid in get_folder_buttons(driver):
+            print(f"  fid='{fid}'  name='{name}'")
     else:
         print(f"Years detected : {', '.join([y[0] for y in year_data])}\n")
 
@@ -424,17 +814,16 @@ try:
         year_dir = os.path.join(BASE_DOWNLOAD_DIR, year_name)
         os.makedirs(year_dir, exist_ok=True)
 
-        # Always reload the page fresh for each year — guarantees clean state
         if not open_year(driver, wait, year_fid):
             continue
 
         # Collect month folder IDs (sidebar is now open for this year)
-        month_data: list[tuple[str, str]] = []
-        for btn in get_folder_buttons(driver):
-            fid = btn.get_attribute("data-folderid") or ""
-            name = (btn.get_attribute("data-foldername") or "").strip()
-            if fid not in year_fids_set and name:
-                month_data.append((name, fid))
+        month_data = [
+            (name, fid)
+            for name, fid in get_month_buttons(driver, year_fid)
+            if fid not in year_fids_set
+        ]
+        _month_fids_by_year[year_fid] = {fid for _, fid in month_data}
 
         if not month_data:
             print("  [WARN] No months found. Table rows:")
@@ -461,13 +850,21 @@ try:
             month_dir = os.path.join(year_dir, month_name)
             os.makedirs(month_dir, exist_ok=True)
             set_download_dir(driver, month_dir)
+            sync_session_cookies(driver, http_session)
+            if download_tracker is not None:
+                try:
+                    download_tracker.set_download_dir(month_dir)
+                except Exception as exc:
+                    print(f" [INFO] download events off ({exc}); polling", end="")
+                    download_tracker.close()
+                    download_tracker = None
 
             # Find the month button in the already-open sidebar
             month_btn = find_btn_by_fid(driver, month_fid)
             if month_btn is None:
                 # Fallback: re-open year accordion and retry once
                 print(" [recovering]", end="", flush=True)
-                if not open_year(driver, wait, year_fid):
+                if not open_year(driver, wait, year_fid, reload=True):
                     print(" [SKIP] could not recover")
                     continue
                 month_btn = find_btn_by_fid(driver, month_fid)
@@ -475,26 +872,27 @@ try:
                     print(" [SKIP] button not found after recovery")
                     continue
 
+            old_row = first_table_row(driver)
             click_btn(driver, month_btn)
-            wait_table_loaded(wait)
+            wait_table_loaded(wait, old_row)
 
             if table_has_no_data(driver):
                 print(" [SKIP] no data")
                 continue
 
             # Set 50 rows per page
+            old_row = first_table_row(driver)
             if try_set_50_rows(driver):
-                wait_table_loaded(wait)
+                wait_table_loaded(wait, old_row)
 
             # Download all pages
             total_downloaded = 0
             total_skipped = 0
             page = 1
-            skip_month = False
 
             while True:
-                links, strategy = get_download_links(driver)
-                if not links:
+                page_hrefs, strategy = get_download_links(driver)
+                if not page_hrefs:
                     if page == 1:
                         rows = driver.find_elements(
                             By.CSS_SELECTOR, f"#{TABLE_ID} tbody tr"
@@ -505,30 +903,29 @@ try:
                     break
 
                 print(
-                    f" [page {page}: {len(links)} files | {strategy}]",
+                    f" [page {page}: {len(page_hrefs)} files | {strategy}]",
                     end="",
                     flush=True,
                 )
 
-                # On page 1, check if all files already exist
-                if page == 1:
-                    existing_before = get_existing_files(month_dir)
-                    # If directory already has reasonable number of files, likely everything exists
-                    if len(existing_before) >= len(links):
-                        print(f" [SKIP] {len(links)} file(s) already exist", end="")
-                        total_skipped += len(links)
-                        skip_month = True
-                        break
-
-                if skip_month:
-                    break
-
-                # Get files that exist before download
+                # Skip links whose file is already on disk — no request at all
+                # (http_download saves under the same href_filename name)
                 existing_before = get_existing_files(month_dir)
-
-                # Click downloads
-                click_download_links(driver, links, existing_before)
-                wait_for_downloads(month_dir, timeout=90)
+                hrefs = [
+                    h for h in page_hrefs if href_filename(h) not in existing_before
+                ]
+
+                # Fetch files directly over HTTP; Selenium clicks only for the
+                # links that can't be fetched that way
+                failed = download_links_http(http_session, hrefs, month_dir)
+                if failed:
+                    if download_tracker is not None:
+                        download_tracker.reset()
+                    click_download_links(driver, failed, existing_before)
+                    if download_tracker is not None:
+                        download_tracker.wait(month_dir, len(failed), timeout=90)
+                    else:
+                        wait_for_downloads(month_dir, timeout=90)
 
                 # Get files that exist after download
                 existing_after = get_existing_files(month_dir)
@@ -536,7 +933,7 @@ try:
                 # Calculate new vs skipped
                 new_files = existing_after - existing_before
                 newly_downloaded = len(new_files)
-                skipped = len(links) - newly_downloaded
+                skipped = len(page_hrefs) - newly_downloaded
 
                 total_downloaded += newly_downloaded
                 total_skipped += skipped
@@ -546,8 +943,9 @@ try:
                     next_btn = driver.find_element(
                         By.CSS_SELECTOR, f"#{TABLE_ID}_next:not(.disabled)"
                     )
+                    old_row = first_table_row(driver)
                     click_btn(driver, next_btn)
-                    wait_table_loaded(wait)
+                    wait_table_loaded(wait, old_row)
                     page += 1
                 except Exception:
                     break  # no more pages
@@ -567,6 +965,9 @@ except Exception as exc:
     logger.exception("Scraping failed")
 
 finally:
+    http_session.close()
+    if download_tracker is not None:
+        download_tracker.close()
     if driver is not None:
         driver.quit()
 
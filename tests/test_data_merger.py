@@ -0,0 +1,195 @@
+"""
+Parity tests for the streaming XLSX reader in src/ingestion/data_merger.py
+against the original pd.read_excel extraction it replaced.
+
+Usage:
+    pytest tests/
+"""
+
+import os
+import sys
+import zipfile
+
+import numpy as np
+import pandas as pd
+import pytest
+
+openpyxl = pytest.importorskip("openpyxl")
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src", "ingestion"))
+import data_merger  # noqa: E402
+
+
+def read_excel_baseline(file_path):
+    """The pre-streaming extraction path (header row 3, columns B and E)."""
+    df = pd.read_excel(file_path, header=None)
+    df.columns = df.iloc[3]
+    df = df.iloc[4:].reset_index(drop=True)
+    df = df.iloc[:, [1, 4]].copy()
+    df.columns = ["timestamp", "actual_demand_mw"]
+    df["actual_demand_mw"] = pd.to_numeric(df["actual_demand_mw"], errors="coerce")
+    return df.dropna(subset=["actual_demand_mw"]).reset_index(drop=True)
+
+
+def write_report(path, extra_sheets=()):
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "Report"
+    ws.append(["NRLDC Intra-Day Forecast"])
+    ws.append([])
+    ws.append(["Date", "01-01-2026"])
+    ws.append(["S.No", "Period", "Forecast", "Block", "Actual Demand"])
+    for i in range(96):
+        h, m = divmod(i * 15, 60)
+        h2, m2 = divmod(i * 15 + 15, 60)
+        period = f"{h:02d}:{m:02d} - {h2:02d}:{m2:02d}"
+        if i == 3:
+            demand = "#N/A"  # written as an error cell (t="e")
+        elif i == 7:
+            demand = "NA"  # stray text → dropped
+        elif i == 9:
+            demand = "45210.5"  # numeric text → kept, as pd.to_numeric does
+        elif i == 11:
+            demand = None  # blank
+        else:
+            demand = 40000 + i * 12.25
+        ws.append([i + 1, period, 1.0, i + 1, demand])
+    ws.append([])
+    ws.append(["", "Period", "", "", "MW"])  # footer / repeated header
+    for title in extra_sheets:
+        other = wb.create_sheet(title)
+        other.append(["x", "00:00 - 00:15", 0, 0, 99999])
+    wb.save(path)
+
+
+def test_streaming_reader_matches_read_excel(tmp_path):
+    path = tmp_path / "nr_forecast_report_01-01-2026.xlsx"
+    write_report(path, extra_sheets=[f"S{i}" for i in range(11)])
+
+    date, table = data_merger.extract_nrldc_data(str(path))
+    expected = read_excel_baseline(path)
+
+    assert date == pd.Timestamp("2026-01-01")
+    assert table.column("timestamp").to_pylist() == list(expected["timestamp"])
+    np.testing.assert_allclose(
+        table.column("actual_demand_mw").to_numpy(),
+        expected["actual_demand_mw"].astype("float32"),
+    )
+    assert table.num_rows == 96 - 3  # #N/A, "NA" and the blank cell dropped
+
+
+def _write_minimal_xlsx(path, rows_xml):
+    ns = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+    rel_ns = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+    pkg_ns = "http://schemas.openxmlformats.org/package/2006/relationships"
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr(
+            "xl/workbook.xml",
+            f'<workbook xmlns="{ns}" xmlns:r="{rel_ns}"><sheets>'
+            '<sheet name="Data" sheetId="1" r:id="rId7"/></sheets></workbook>',
+        )
+        zf.writestr(
+            "xl/_rels/workbook.xml.rels",
+            f'<Relationships xmlns="{pkg_ns}">'
+            '<Relationship Id="rId7" Target="worksheets/sheet2.xml"/>'
+            "</Relationships>",
+        )
+        zf.writestr(
+            "xl/worksheets/sheet2.xml",
+            f'<worksheet xmlns="{ns}"><sheetData>{rows_xml}</sheetData></worksheet>',
+        )
+        zf.writestr(
+            "xl/worksheets/sheet1.xml",
+            f'<worksheet xmlns="{ns}"><sheetData></sheetData></worksheet>',
+        )
+
+
+def test_inline_and_formula_strings(tmp_path):
+    rows = "".join(f'<row r="{r}"><c r="B{r}"><v>0</v></c></row>' for r in range(1, 5))
+    rows += (
+        '<row r="5"><c r="B5" t="inlineStr"><is><t>00:00 - 00:15</t></is></c>'
+        '<c r="E5" t="str"><v>46000</v></c></row>'
+        '<row r="6"><c r="B6" t="inlineStr"><is><t>00:15 - 00:30</t></is></c>'
+        '<c r="E6"><v>46100.5</v></c></row>'
+    )
+    path = tmp_path / "report.xlsx"
+    _write_minimal_xlsx(path, rows)
+
+    timestamps, demands = data_merger._read_demand_rows(str(path))
+
+    # The first sheet is resolved through workbook.xml rels, not "sheet1.xml"
+    assert timestamps == ["00:00 - 00:15", "00:15 - 00:30"]
+    assert demands.tolist() == [46000.0, 46100.5]
+
+
+def test_manifest_discarded_when_extraction_version_changes(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "_cache"
+    (cache_dir / "2026" / "Jan").mkdir(parents=True)
+    monkeypatch.setattr(data_merger, "MANIFEST_FILE", str(tmp_path / ".manifest.json"))
+    monkeypatch.setattr(data_merger, "CACHE_DIR", str(cache_dir))
+
+    files = {"2026/Jan/a.xlsx": [1, 2, "abc"]}
+    data_merger._save_manifest(files)
+    assert data_merger._load_manifest() == files
+    assert cache_dir.exists()
+
+    monkeypatch.setattr(data_merger, "EXTRACT_VERSION", data_merger.EXTRACT_VERSION + 1)
+    assert data_merger._load_manifest() == {}
+    assert not cache_dir.exists()
+
+
+def test_main_reuses_cache_and_prunes_removed_files(tmp_path, monkeypatch, capsys):
+    raw_dir = tmp_path / "raw"
+    out_dir = tmp_path / "extracted"
+    out_dir.mkdir()
+    monkeypatch.setattr(data_merger, "DOWNLOAD_DIR", str(raw_dir))
+    monkeypatch.setattr(data_merger, "OUTPUT_FILE", str(out_dir / "out.parquet"))
+    monkeypatch.setattr(data_merger, "MANIFEST_FILE", str(out_dir / ".manifest.json"))
+    monkeypatch.setattr(data_merger, "CACHE_DIR", str(out_dir / "_cache"))
+    monkeypatch.setattr(data_merger, "WRITE_CSV", False)
+
+    names = [
+        "2026/Jan/nr_forecast_report_02-01-2026.xlsx",
+        "2026/Jan/nr_forecast_report_01-01-2026.xlsx",
+        "2026/Feb/nr-forecast-report-01-02-2026.xlsx",
+    ]
+    for name in names:
+        (raw_dir / name).parent.mkdir(parents=True, exist_ok=True)
+        write_report(raw_dir / name)
+
+    data_merger.main()
+    first = pd.read_parquet(out_dir / "out.parquet")
+    assert "cached" not in capsys.readouterr().out
+    assert len(first) == 3 * 93
+    assert first["date"].is_monotonic_increasing
+    assert list(first["date"].dt.date.unique().astype(str)) == [
+        "2026-01-01",
+        "2026-01-02",
+        "2026-02-01",
+    ]
+
+    # Nothing changed → every file comes from the cache, output is identical
+    data_merger.main()
+    out = capsys.readouterr().out
+    assert "(3 unchanged, cached)" in out
+    assert "Processing..." not in out
+    pd.testing.assert_frame_equal(pd.read_parquet(out_dir / "out.parquet"), first)
+
+    # A touched workbook is extracted again, a deleted one leaves the cache
+    touched = raw_dir / names[0]
+    st = os.stat(touched)
+    os.utime(touched, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    (raw_dir / names[2]).unlink()
+
+    data_merger.main()
+    out = capsys.readouterr().out
+    assert "(1 unchanged, cached)" in out
+    assert "Processing... 1/1" in out
+
+    manifest = data_merger._load_manifest()
+    assert sorted(manifest) == sorted(os.path.normpath(n) for n in names[:2])
+    assert not os.path.exists(data_merger._cache_path(os.path.normpath(names[2])))
+    pd.testing.assert_frame_equal(
+        pd.read_parquet(out_dir / "out.parquet"),
+        first[first["date"] < "2026-02-01"].reset_index(drop=True),
+    )